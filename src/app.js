@@ -3,16 +3,27 @@
     var vibe = require('ui/vibe');
     var settings = require('settings');
     var resultCard = new ui.Card();
+    var departuresCache = {};
+    var shownUrl = null;
+    var DEPARTURES_CACHE_TTL = 30000;
+    var CLIENT_ERROR_TTL = 10000;
+    var API_LOCATIONS_URL = 'https://api.9292.nl/0.1/locations/';
+    var API_DEPARTURES_PATH = '/departure-times?lang=en-GB';
 
 
 
     var trip = {
         destinations: [{
             title: "Home",
-            subtitle: "Home sweet home"
+            subtitle: "Home sweet home",
+            apiUrl: API_LOCATIONS_URL + 'aalsmeer/bushalte-dorpsstraat' + API_DEPARTURES_PATH,
+            destinationName: 'Haarlem Station'
         }, {
             title: "Work",
-            subtitle: "It's off to work we go"
+            subtitle: "It's off to work we go",
+            apiUrl: API_LOCATIONS_URL + 'haarlem/bushalte-raaksbrug' + API_DEPARTURES_PATH,
+            destinationName: 'Uithoorn Busstation',
+            cardIcon: 'images/bus.png'
         }],
         configureSettings: function() {
             settings.config({
@@ -28,19 +39,12 @@
             );
         },
         showResultCard: function(coordinates, event) {
-            if (trip.destinations[event.itemIndex].title == 'Home') {
-                resultCard.title('Home');
-                var chosenDeparture = 'aalsmeer/bushalte-dorpsstraat';
-                var chosenDestination = 'Haarlem Station';
-                var APIURL = 'https://api.9292.nl/0.1/locations/' + chosenDeparture + '/departure-times?lang=en-GB';
-            } else {
-                resultCard.title('Work');
-                resultCard.icon('images/bus.png');
-                var chosenDeparture = 'haarlem/bushalte-raaksbrug';
-                var chosenDestination = 'Uithoorn Busstation';
-                var APIURL = 'https://api.9292.nl/0.1/locations/' + chosenDeparture + '/departure-times?lang=en-GB';
+            var chosen = trip.destinations[event.itemIndex];
+            resultCard.title(chosen.title);
+            if (chosen.cardIcon) {
+                resultCard.icon(chosen.cardIcon);
             }
-            trip.nextBus(APIURL, chosenDestination);
+            trip.nextBus(chosen.apiUrl, chosen.destinationName);
             resultCard.show();
         },
         getLocation: function(event) {
@@ -61,34 +65,69 @@
             navigator.geolocation.getCurrentPosition(locationSuccess, locationError, locationOptions);
         },
         nextBus: function(APIURL, chosenDestination) {
-            resultCard.subtitle('Loading...');
-            resultCard.body('Please wait');
+            shownUrl = APIURL;
+            var cached = departuresCache[APIURL];
+            if (cached && Date.now() < cached.expiresAt) {
+                trip.showDeparture(cached.departures, chosenDestination);
+                return;
+            }
+            resultCard.prop({
+                subtitle: 'Loading...',
+                body: 'Please wait'
+            });
             ajax({
                     url: APIURL,
                     type: 'json'
                 },
                 function(data) {
                     var departures = data.tabs[0].departures;
-                    var i = 0;
-                    for (i = 0; i < departures.length; i++) {
-                        if (departures[i].destinationName == chosenDestination) {
-                            var time = departures[i].time;
-                            var destination = departures[i].destinationName;
-                            resultCard.subtitle(time);
-                            var delay = '';
-                            if (departures[i].realtimeText) {
-                                delay = departures[i].realtimeText;
-                            }
-                            resultCard.body(destination + '\n' + delay);
-                            vibe.vibrate('short');
-                            break;
-                        }
+                    departuresCache[APIURL] = {
+                        expiresAt: Date.now() + DEPARTURES_CACHE_TTL,
+                        departures: departures
+                    };
+                    if (APIURL === shownUrl) {
+                        trip.showDeparture(departures, chosenDestination);
                     }
                 },
-                function(error) {
-                    console.log('Failed fetching bus data: ' + error);
+                function(error, status) {
+                    console.log('Failed fetching bus data (' + status + '): ' + error);
+                    if (status >= 400 && status < 500) {
+                        departuresCache[APIURL] = {
+                            expiresAt: Date.now() + CLIENT_ERROR_TTL,
+                            departures: null
+                        };
+                    }
+                    if (APIURL === shownUrl) {
+                        trip.showDeparture(null, chosenDestination);
+                    }
                 }
             );
+        },
+        showDeparture: function(departures, chosenDestination) {
+            if (!departures) {
+                resultCard.prop({
+                    subtitle: 'Unavailable',
+                    body: 'Could not reach 9292'
+                });
+                return;
+            }
+            var i = 0;
+            var count = departures.length;
+            for (i = 0; i < count; i++) {
+                var departure = departures[i];
+                if (departure.destinationName == chosenDestination) {
+                    resultCard.prop({
+                        subtitle: departure.time,
+                        body: chosenDestination + '\n' + (departure.realtimeText || '')
+                    });
+                    vibe.vibrate('short');
+                    return;
+                }
+            }
+            resultCard.prop({
+                subtitle: 'No departures',
+                body: chosenDestination
+            });
         }
 
 